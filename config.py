@@ -44,3 +44,25 @@ COLORS = {
     "J": (0, 112, 224),
     "L": (255, 144, 0),
 }
+
+# 헤드리스 세션 서버 (server/session_server.py)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 7777
+SERVER_MAX_BUFFER = 256 * 1024  # 클라이언트 송신 버퍼 한도 (bytes)
+
+# 샘플링 프로파일러 (F9 / SIGUSR1 토글, diag/profiler.py)
+PROFILE_SAMPLE_MS = 5         # 샘플 간격
+PROFILE_SECONDS = 10          # 한 번 켜면 기록하는 시간
+PROFILE_DIR = "profiles"      # *.folded / *.slow.txt 출력 위치
+
+# 소크 테스트 (diag/soak.py)
+SOAK_SAMPLE_SECONDS = 60          # 텔레메트리 샘플 간격
+SOAK_LOG = "soak.log"             # JSON lines, 롤링
+SOAK_LOG_BYTES = 4 * 1024 * 1024  # 로그 파일당 최대 크기
+SOAK_TOP_N = 10                   # tracemalloc 상위 할당 위치 수
+SOAK_RSS_GROWTH_MB_PER_HOUR = 16  # 초과 시 경고
+SOAK_ALLOC_GROWTH_KB = 512        # 기준 스냅샷 대비 한 위치의 증가량 경고 임계
+SOAK_FRAME_DRIFT_RATIO = 1.5      # 첫 샘플 대비 p95 프레임 시간 배율 경고 임계
+SOAK_RSS_MIN_SPAN_HOURS = 1.0     # RSS 기울기를 판단하기 전 최소 관측 구간
+SOAK_SURFACE_GROWTH = 100         # 기준 대비 살아 있는 pygame.Surface 증가 경고 임계
+SOAK_UNTRACED_GROWTH_MB = 64      # tracemalloc 밖(네이티브) RSS 증가 경고 임계
@@ -0,0 +1,162 @@
+# ===== diag/profiler.py (on-demand sampling profiler) =====
+from __future__ import annotations
+from collections import Counter
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import FPS, PROFILE_SAMPLE_MS, PROFILE_SECONDS, PROFILE_DIR
+
+
+def _label(frame) -> str:
+    """'logic.game:Game.step' 형태. Game / HandController / 렌더 함수가 그대로 드러나도록"""
+    code = frame.f_code
+    mod = frame.f_globals.get("__name__", "?")
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{mod}:{name}"
+
+
+class SamplingProfiler:
+    """토글하면 duration_s 동안 모든 스레드의 스택을 샘플링해 collapsed-stack 파일로 기록.
+
+    꺼져 있을 때는 스레드도, 훅도 없음. 메인 루프는 `active`일 때만 mark_frame()을 부르고,
+    시그널로 들어온 토글 요청(`requested`)은 다음 프레임에서 toggle(frame_no)로 처리.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_SAMPLE_MS, duration_s: float = PROFILE_SECONDS,
+                 out_dir: str = PROFILE_DIR, frame_budget_ms: float = 1000.0 / FPS):
+        self.interval = interval_ms / 1000.0
+        self.duration = duration_s
+        self.out_dir = out_dir
+        self.frame_budget_ms = frame_budget_ms
+
+        self.active = False
+        self.requested = False               # 시그널 핸들러가 남긴 토글 요청
+        self.frame_no = 0                    # 메인 루프가 현재 그리고 있는 프레임 번호
+        self.slow_frames: Dict[int, float] = {}  # 예산 초과 프레임 -> ms
+        self._samples: Counter = Counter()   # (thread, frame_no | None, stack) -> count
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._main_ident = threading.main_thread().ident
+        self.last_output: Optional[str] = None
+        self._runs = 0                       # 출력 파일 이름 구분용
+        self._signal: Optional[Tuple[int, object]] = None  # (signum, 이전 핸들러)
+
+    # ---------- 제어 ----------
+    def start(self, frame_no: int = 0):
+        if self.active:
+            return
+        self.active = True
+        self.frame_no = frame_no
+        self._runs += 1
+        self.slow_frames = {}
+        self._samples = Counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        print(f"[profiler] sampling every {self.interval*1000:.0f}ms for {self.duration:g}s")
+
+    def stop(self):
+        if not self.active:
+            return
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def toggle(self, frame_no: int = 0):
+        self.requested = False
+        if self.active:
+            self.stop()
+        else:
+            self.start(frame_no)
+
+    def install_signal(self, signum: Optional[int] = None):
+        """POSIX 시그널(기본 SIGUSR1)로 토글 요청. 지원하지 않는 플랫폼에서는 무시"""
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            return
+
+        def _request(*_):
+            self.requested = True
+        self._signal = (signum, signal.signal(signum, _request))
+
+    def restore_signal(self):
+        """install_signal() 이전의 핸들러로 되돌림"""
+        if self._signal is not None:
+            signum, prev = self._signal
+            signal.signal(signum, prev if prev is not None else signal.SIG_DFL)
+            self._signal = None
+
+    def mark_frame(self, frame_no: int, frame_ms: float):
+        """frame_no 프레임이 frame_ms 걸렸음을 기록하고 다음 프레임으로 넘어감"""
+        if frame_ms > self.frame_budget_ms:
+            self.slow_frames[frame_no] = frame_ms
+        self.frame_no = frame_no + 1
+
+    # ---------- 샘플링 ----------
+    def _run(self):
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        labels: Dict[object, str] = {}
+        samples: Counter = self._samples
+        tag = f"{self._runs}-f{self.frame_no}"
+        deadline = time.perf_counter() + self.duration
+        try:
+            self._sample_loop(own, names, labels, samples, deadline)
+        finally:
+            # 기록을 마친 뒤에야 active를 내려서, 그 사이의 토글이 이번 결과를 덮어쓰지 않게 함
+            try:
+                self.last_output = self._write(samples, dict(self.slow_frames), tag)
+            finally:
+                self.active = False
+
+    def _sample_loop(self, own: int, names: Dict[int, str], labels: Dict[object, str],
+                     samples: Counter, deadline: float):
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            frame_no = self.frame_no
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                name = names.get(ident)
+                if name is None:
+                    for t in threading.enumerate():
+                        names[t.ident] = t.name
+                    name = names.get(ident, str(ident))
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _label(frame)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.reverse()
+                tag = frame_no if ident == self._main_ident else None
+                samples[(name, tag, tuple(stack))] += 1
+            self._stop.wait(self.interval)
+
+    def _write(self, samples: Counter, slow: Dict[int, float], tag: str) -> str:
+        """flamegraph.pl / speedscope 호환 collapsed-stack 파일과 느린 프레임 목록 작성"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        # 같은 초에 여러 번 토글해도 덮어쓰지 않도록 실행 번호와 시작 프레임을 붙임
+        path = os.path.join(self.out_dir, time.strftime("profile-%Y%m%d-%H%M%S") + f"-{tag}.folded")
+        merged: Counter = Counter()
+        for (name, frame_no, stack), n in samples.items():
+            root: Tuple[str, ...] = (name,)
+            if frame_no in slow:
+                # 예산을 넘긴 프레임의 샘플은 프레임 번호로 묶어 따로 보이게 함
+                root += (f"slow_frame_{frame_no}_{slow[frame_no]:.0f}ms",)
+            merged[";".join(root + stack)] += n
+        with open(path, "w") as f:
+            for line, n in merged.most_common():
+                f.write(f"{line} {n}\n")
+        with open(path[:-len(".folded")] + ".slow.txt", "w") as f:
+            f.write(f"# frame budget {self.frame_budget_ms:.1f}ms\n")
+            for frame_no, ms in sorted(slow.items()):
+                f.write(f"{frame_no} {ms:.1f}\n")
+        print(f"[profiler] wrote {path} ({sum(merged.values())} samples, {len(slow)} slow frames)")
+        return path
@@ -0,0 +1,415 @@
+# ===== diag/soak.py (long-running soak + drift telemetry) =====
+from __future__ import annotations
+from dataclasses import dataclass, field
+import argparse
+import gc
+import json
+import logging
+import logging.handlers
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from logic.game import Game, Action, GameState
+from config import (
+    BOARD_COLS, BOARD_ROWS, CELL_SIZE, MARGIN, FPS,
+    SOAK_SAMPLE_SECONDS, SOAK_LOG, SOAK_LOG_BYTES, SOAK_TOP_N,
+    SOAK_RSS_GROWTH_MB_PER_HOUR, SOAK_RSS_MIN_SPAN_HOURS, SOAK_ALLOC_GROWTH_KB,
+    SOAK_FRAME_DRIFT_RATIO, SOAK_SURFACE_GROWTH, SOAK_UNTRACED_GROWTH_MB,
+)
+
+# 누수 후보로 특히 지켜볼 할당 위치 (파일 경로 일부).
+# tracemalloc은 파이썬/numpy 할당만 보므로 여기엔 numpy 프레임 복사본만 해당.
+# SDL Surface 픽셀 버퍼나 MediaPipe C++ 버퍼는 Surface 개수와 untraced RSS로 따로 봄.
+WATCH = (
+    "input/hand_input.py",       # HandController.last_frame 복사본
+)
+
+
+# ===== Input sources =====
+def autoplay(game: Game, rng: random.Random) -> Iterator[List[Action]]:
+    """피스마다 무작위 회전/칼럼을 정해 이동한 뒤 하드드롭하는 단순 봇. 프레임당 액션 리스트를 yield"""
+    while True:
+        piece = game.active
+        if piece is None or game.state is not GameState.RUNNING:
+            yield []
+            continue
+        acts = [Action.ROTATE_CW] * rng.randrange(4)
+        dc = rng.randrange(game.cols) - piece.c
+        acts += [Action.MOVE_RIGHT if dc > 0 else Action.MOVE_LEFT] * abs(dc)
+        for act in acts:
+            yield [act]
+        for _ in range(rng.randrange(1, 20)):
+            yield []
+        yield [Action.HARD_DROP]
+
+
+Segment = Tuple[Optional[int], Dict[int, List[Action]]]  # (게임 시드, 게임 내 프레임 -> 액션)
+
+
+def load_stream(path: str) -> List[Segment]:
+    """녹화 파일 -> 게임별 구간 리스트.
+
+    'GAME <seed>' 줄이 새 게임의 시작이고, 그 뒤의 '<게임 내 프레임> <ACTION 이름>' 줄이 그 게임의 입력.
+    """
+    out: List[Segment] = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            a, b = line.split()
+            if a == "GAME":
+                out.append((int(b), {}))
+                continue
+            if not out:
+                out.append((None, {}))  # 마커 없는 파일
+            out[-1][1].setdefault(int(a), []).append(Action[b])
+    return out
+
+
+# ===== Telemetry =====
+def rss_mb() -> Optional[float]:
+    """현재 RSS (리눅스는 /proc, 그 외 POSIX는 최대 RSS로 대체, 윈도우는 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def count_surfaces() -> Optional[int]:
+    """살아 있는 pygame.Surface 개수 (pygame을 안 쓰면 None).
+
+    Surface는 GC 추적 대상이 아닐 수 있어, 추적 객체와 그 직접 참조 대상까지 훑음.
+    """
+    pygame = sys.modules.get("pygame")
+    if pygame is None:
+        return None
+    surface = pygame.Surface
+    seen = set()
+    for obj in gc.get_objects():
+        if isinstance(obj, surface):
+            seen.add(id(obj))
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, surface):
+                seen.add(id(ref))
+    return len(seen)
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+class GcTimer:
+    """gc.callbacks로 GC 멈춤 시간을 잼"""
+
+    def __init__(self):
+        self.pauses: List[float] = []
+        self._t0 = 0.0
+
+    def __call__(self, phase: str, info: dict):
+        if phase == "start":
+            self._t0 = time.perf_counter()
+        else:
+            self.pauses.append((time.perf_counter() - self._t0) * 1000.0)
+
+    def install(self):
+        gc.callbacks.append(self)
+
+    def remove(self):
+        if self in gc.callbacks:
+            gc.callbacks.remove(self)
+
+    def drain(self) -> List[float]:
+        out, self.pauses = self.pauses, []
+        return out
+
+
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),  # 소크 루프 자신의 프레임 시간 버퍼 등
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+@dataclass
+class SoakMonitor:
+    """주기적으로 RSS / tracemalloc / GC / 프레임 시간을 샘플링해 롤링 로그에 기록하고 증가 추세를 경고"""
+    log_path: str = SOAK_LOG
+    sample_seconds: float = SOAK_SAMPLE_SECONDS
+    top_n: int = SOAK_TOP_N
+    trace: bool = True
+
+    frame_ms: List[float] = field(default_factory=list)
+    history: List[Tuple[float, float]] = field(default_factory=list)  # (경과 시간 h, RSS MB)
+    first_p95: Optional[float] = None
+    baseline: Optional[tracemalloc.Snapshot] = None
+    base_rss: Optional[float] = None
+    base_traced: int = 0
+    base_tm_overhead: int = 0
+    base_surfaces: Optional[int] = None
+    games: int = 0
+
+    def __post_init__(self):
+        self.gc_timer = GcTimer()
+        self.log = logging.getLogger("soak")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        handler = logging.handlers.RotatingFileHandler(self.log_path, maxBytes=SOAK_LOG_BYTES, backupCount=3)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.log.addHandler(handler)
+        self.t_start = time.monotonic()
+        self.next_sample = self.t_start + self.sample_seconds
+
+    def start(self):
+        self.gc_timer.install()
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        self.gc_timer.remove()
+        for h in list(self.log.handlers):
+            self.log.removeHandler(h)
+            h.close()
+
+    def frame(self, ms: float):
+        self.frame_ms.append(ms)
+        now = time.monotonic()
+        if now >= self.next_sample:
+            self.next_sample = now + self.sample_seconds
+            self.sample(now)
+
+    def sample(self, now: float) -> dict:
+        hours = (now - self.t_start) / 3600.0
+        rss = rss_mb()
+        if rss is not None:
+            self.history.append((hours, rss))
+        surfaces = count_surfaces()
+
+        frames = sorted(self.frame_ms)
+        self.frame_ms = []
+        pauses = self.gc_timer.drain()
+        p95 = percentile(frames, 0.95)
+        if self.first_p95 is None and frames:
+            self.first_p95 = p95
+
+        rec = {
+            "t_h": round(hours, 4),
+            "games": self.games,
+            "rss_mb": round(rss, 2) if rss is not None else None,
+            "surfaces": surfaces,
+            "frames": len(frames),
+            "frame_ms": {q: round(percentile(frames, v), 3)
+                         for q, v in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))},
+            "frame_ms_max": round(frames[-1], 3) if frames else 0.0,
+            "gc": {"count": len(pauses), "total_ms": round(sum(pauses), 3),
+                   "max_ms": round(max(pauses), 3) if pauses else 0.0},
+        }
+
+        growth: List[tracemalloc.StatisticDiff] = []
+        untraced: Optional[float] = None
+        if tracemalloc.is_tracing():
+            traced = tracemalloc.get_traced_memory()[0]
+            overhead = tracemalloc.get_tracemalloc_memory()  # tracemalloc 자체 장부도 RSS에 잡힘
+            if self.base_rss is None:
+                self.base_rss, self.base_traced, self.base_tm_overhead = rss, traced, overhead
+            elif rss is not None and self.base_rss is not None:
+                # RSS 증가 중 tracemalloc이 설명하지 못하는 부분 = 네이티브(SDL, MediaPipe 등) 쪽
+                untraced = (rss - self.base_rss) - (
+                    (traced - self.base_traced) + (overhead - self.base_tm_overhead)) / 2**20
+                rec["untraced_growth_mb"] = round(untraced, 2)
+            snap = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            rec["top_alloc"] = [
+                {"where": str(st.traceback[0]), "kb": round(st.size / 1024, 1), "count": st.count}
+                for st in snap.statistics("lineno")[:self.top_n]
+            ]
+            if self.baseline is None:
+                self.baseline = snap  # 첫 샘플(워밍업 이후)을 기준으로 삼음
+            else:
+                growth = snap.compare_to(self.baseline, "lineno")
+
+        if self.base_surfaces is None:
+            self.base_surfaces = surfaces
+        rec["warnings"] = self.check(growth, p95, surfaces, untraced)
+        self.log.info(json.dumps(rec, ensure_ascii=False))
+        for w in rec["warnings"]:
+            print(f"[soak] {w}")
+        return rec
+
+    # ---------- 회귀 체크 ----------
+    def check(self, growth: List[tracemalloc.StatisticDiff], p95: float,
+              surfaces: Optional[int] = None, untraced: Optional[float] = None) -> List[str]:
+        out: List[str] = []
+
+        slope = self.rss_slope()
+        if slope is not None and slope > SOAK_RSS_GROWTH_MB_PER_HOUR:
+            out.append(f"RSS growing {slope:.1f} MB/h (limit {SOAK_RSS_GROWTH_MB_PER_HOUR})")
+
+        for d in growth:
+            kb = d.size_diff / 1024
+            if kb <= SOAK_ALLOC_GROWTH_KB:
+                continue
+            where = str(d.traceback[0])
+            watched = any(w in where.replace(os.sep, "/") for w in WATCH)
+            out.append(f"{'WATCH ' if watched else ''}alloc +{kb:.0f} KB since baseline at {where}")
+
+        if surfaces is not None and self.base_surfaces is not None \
+                and surfaces - self.base_surfaces > SOAK_SURFACE_GROWTH:
+            out.append(f"live pygame.Surface {self.base_surfaces} -> {surfaces}")
+
+        if untraced is not None and untraced > SOAK_UNTRACED_GROWTH_MB:
+            out.append(f"untraced (native) RSS +{untraced:.1f} MB since baseline")
+
+        if self.first_p95 and p95 > self.first_p95 * SOAK_FRAME_DRIFT_RATIO:
+            out.append(f"frame p95 drifted {self.first_p95:.2f} -> {p95:.2f} ms")
+        return out
+
+    def rss_slope(self) -> Optional[float]:
+        """RSS(MB) 대 시간(h)의 최소제곱 기울기. 첫 샘플(워밍업 구간)은 제외하고,
+        SOAK_RSS_MIN_SPAN_HOURS 이상 쌓이기 전에는 잡음이 커서 판단하지 않음"""
+        pts = self.history[1:]
+        if len(pts) < 3 or pts[-1][0] - pts[0][0] < SOAK_RSS_MIN_SPAN_HOURS:
+            return None
+        n = len(pts)
+        mt = sum(t for t, _ in pts) / n
+        mr = sum(r for _, r in pts) / n
+        var = sum((t - mt) ** 2 for t, _ in pts)
+        if var == 0:
+            return None
+        return sum((t - mt) * (r - mr) for t, r in pts) / var
+
+
+# ===== Main loop =====
+def soak(source: str = "autoplay", minutes: float = 0, render: bool = False, throttle: bool = True,
+         record: Optional[str] = None, seed: int = 0, monitor: Optional[SoakMonitor] = None) -> SoakMonitor:
+    """GAME_OVER마다 같은 Game 객체를 reset()으로 재사용하며 minutes 동안(0이면 무한) 실행.
+
+    게임마다 시드를 정해 reset(seed)하므로, 녹화 파일의 'GAME <seed>' 구간을 재생하면 같은 피스 순서가 나옴.
+    """
+    rng = random.Random(seed)
+    game = Game(rows=BOARD_ROWS, cols=BOARD_COLS, rng=random.Random(seed))
+    monitor = monitor or SoakMonitor()
+
+    stream = load_stream(source) if source not in ("autoplay", "hand") else None
+    actions: Dict[int, List[Action]] = {}
+    bot = autoplay(game, rng) if source == "autoplay" else None
+    hand = None
+    screen = font = big = None
+    if source == "hand" or render:
+        import pygame
+        from gui.pygame_frontend import draw_frame, bin_step_action, FONT_NAME
+        from input.hand_input import HandController
+        if source == "hand":
+            hand = HandController(camera=0, draw=False)
+        if render:
+            pygame.init()
+            play_w = BOARD_COLS * CELL_SIZE
+            play_h = BOARD_ROWS * CELL_SIZE
+            screen = pygame.display.set_mode((play_w + 9 * CELL_SIZE + 3*MARGIN, play_h + 2*MARGIN))
+            font = pygame.font.SysFont(FONT_NAME, 20)
+            big = pygame.font.SysFont(FONT_NAME, 24, bold=True)
+
+    rec_file = open(record, "w") if record else None
+    period = 1.0 / FPS
+    deadline = time.monotonic() + minutes * 60 if minutes else None
+    local_frame = 0
+    game_no = 0
+
+    def new_game():
+        nonlocal actions, local_frame
+        game_seed = seed + game_no
+        if stream:
+            stream_seed, actions = stream[game_no % len(stream)]
+            if stream_seed is not None:
+                game_seed = stream_seed
+        game.reset(game_seed)
+        if rec_file is not None:
+            rec_file.write(f"GAME {game_seed}\n")
+        local_frame = 0
+
+    monitor.start()
+    try:
+        new_game()
+        while deadline is None or time.monotonic() < deadline:
+            t0 = time.perf_counter()
+
+            if game.state is GameState.GAME_OVER:
+                game_no += 1
+                monitor.games += 1
+                new_game()
+
+            target_bin: Optional[int] = None
+            if bot is not None:
+                acts = next(bot)
+            elif stream is not None:
+                acts = actions.get(local_frame, [])
+            else:
+                # 키오스크(run(use_absolute_bins=True))와 같은 경로: 핀치 액션 + 손바닥 bin 스냅
+                acts, target_bin = hand.poll_with_meta()
+            for act in acts:
+                game.step(act)
+                if rec_file is not None:
+                    rec_file.write(f"{local_frame} {act.name}\n")
+            if hand is not None:
+                snap = bin_step_action(game, target_bin)
+                if snap is not None:
+                    game.step(snap)
+                    if rec_file is not None:
+                        rec_file.write(f"{local_frame} {snap.name}\n")
+            game.step(Action.TICK)
+
+            if screen is not None:
+                pygame.event.pump()
+                draw_frame(screen, game, hand, font, big)
+                pygame.display.flip()
+
+            local_frame += 1
+            work = time.perf_counter() - t0
+            monitor.frame(work * 1000.0)
+            if throttle and work < period:
+                time.sleep(period - work)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop()
+        if rec_file is not None:
+            rec_file.close()
+        if hand is not None:
+            hand.release()
+        if screen is not None:
+            pygame.quit()
+    return monitor
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Hand-Tetris soak test")
+    ap.add_argument("--input", default="autoplay", help="autoplay | hand | 녹화 파일 경로")
+    ap.add_argument("--minutes", type=float, default=0, help="0이면 Ctrl+C까지")
+    ap.add_argument("--render", action="store_true", help="pygame 렌더링 경로까지 포함")
+    ap.add_argument("--fast", action="store_true", help="FPS 제한 없이 실행")
+    ap.add_argument("--record", default=None, help="입력 액션을 녹화 파일로 저장")
+    ap.add_argument("--sample-seconds", type=float, default=SOAK_SAMPLE_SECONDS)
+    ap.add_argument("--log", default=SOAK_LOG)
+    ap.add_argument("--no-tracemalloc", action="store_true")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    monitor = SoakMonitor(log_path=args.log, sample_seconds=args.sample_seconds, trace=not args.no_tracemalloc)
+    soak(args.input, args.minutes, args.render, not args.fast, args.record, args.seed, monitor)
+
+
+if __name__ == "__main__":
+    main()
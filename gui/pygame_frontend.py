@@ -6,6 +6,7 @@ from config import BOARD_COLS, BOARD_ROWS, CELL_SIZE, MARGIN, FPS, COLORS, NEXT_
 
 
 from input.hand_input import HandController
+from diag.profiler import SamplingProfiler
 
 import cv2
 
@@ -35,6 +36,11 @@ def run(use_hand: bool = True, hand_draw_preview: bool = False, use_absolute_bin
     elif use_hand and not HAND_AVAILABLE:
         print("HandController 사용 불가.")
 
+    # F9 또는 SIGUSR1로 켜는 샘플링 프로파일러 (꺼져 있으면 비용 없음)
+    profiler = SamplingProfiler()
+    profiler.install_signal()
+    frame_no = 0
+
     running = True
     try:
         while running:
@@ -56,6 +62,10 @@ def run(use_hand: bool = True, hand_draw_preview: bool = False, use_absolute_bin
                         game.step(Action.SOFT_DROP)
                     elif event.key == pygame.K_SPACE:
                         game.step(Action.HARD_DROP)
+                    elif event.key == pygame.K_F9:
+                        profiler.toggle(frame_no)
+            if profiler.requested:  # SIGUSR1
+                profiler.toggle(frame_no)
 
             target_bin: Optional[int] = None
             if hand is not None:
@@ -67,77 +77,87 @@ def run(use_hand: bool = True, hand_draw_preview: bool = False, use_absolute_bin
                     for act in hand.poll():
                         game.step(act)
 
-            if use_hand and use_absolute_bins and target_bin is not None and game.state is GameState.RUNNING and game.active is not None:
-                desired_c = _target_col_from_bin(game, target_bin)
-                if game.active.c < desired_c:
-                    game.step(Action.MOVE_RIGHT)
-                elif game.active.c > desired_c:
-                    game.step(Action.MOVE_LEFT)
+            if use_hand and use_absolute_bins:
+                snap = bin_step_action(game, target_bin)
+                if snap is not None:
+                    game.step(snap)
 
             game.step(Action.TICK)
 
             # --- Render ---
-            screen.fill(COLORS["bg"])
-
-            field_rect = pygame.Rect(MARGIN, MARGIN, play_w, play_h)
-            pygame.draw.rect(screen, COLORS["frame"], field_rect, width=2)
-
-            for r in range(BOARD_ROWS):
-                y = MARGIN + r*CELL_SIZE
-                pygame.draw.line(screen, COLORS["grid"], (MARGIN, y), (MARGIN+play_w, y))
-            for c in range(BOARD_COLS):
-                x = MARGIN + c*CELL_SIZE
-                pygame.draw.line(screen, COLORS["grid"], (x, MARGIN), (x, MARGIN+play_h))
-
-            for r, c in game.get_ghost_cells():
-                draw_cell(screen, r, c, (255,255,255), alpha=70)
-
-            for r, c, k in game.get_cells():
-                draw_cell(screen, r, c, COLORS[k])
-
-            panel_x = MARGIN*2 + play_w
-            panel_y = MARGIN
-
-            # NEXT panel
-            title = big.render("NEXT", True, COLORS["text"])
-            screen.blit(title, (panel_x, panel_y))
-            panel_y += 28
-
-            queue = game.get_next_queue()[:NEXT_PREVIEW_COUNT]
-            for i, kind in enumerate(queue):
-                draw_mini_piece(screen, kind, panel_x, panel_y + i*CELL_SIZE*3)
-
-            info_y = panel_y + NEXT_PREVIEW_COUNT*CELL_SIZE*3 + 10
-            score_surf = font.render(f"Score: {game.score}", True, COLORS["text"])
-            lines_surf = font.render(f"Lines: {game.lines_cleared}", True, COLORS["text"])
-            screen.blit(score_surf, (panel_x, info_y))
-            screen.blit(lines_surf, (panel_x, info_y + 22))
-
-            # Camera preview (below the info)
-            cam_frame = hand.get_last_frame() if hand is not None else None
-            if cam_frame is not None:
-                cam_h = int(CELL_SIZE * 6)
-                cam_w = CELL_SIZE * 8
-                preview = cv2.cvtColor(cam_frame, cv2.COLOR_BGR2RGB)
-                preview = cv2.resize(preview, (cam_w, cam_h))
-                surf = pygame.image.frombuffer(preview.tobytes(), (cam_w, cam_h), 'RGB')
-                screen.blit(surf, (panel_x, info_y + 48))
-
-            # hint = font.render("←/→ Move  ↑/Z Rot  ↓ Soft  SPACE Hard  |  Palm bins ON | Hold removed", True, COLORS["text"])
-            # screen.blit(hint, (MARGIN + 8, play_h + MARGIN - 24))
-
-            if game.state is GameState.GAME_OVER:
-                overlay = big.render("GAME OVER — press ESC", True, COLORS["text"])
-                screen.blit(overlay, (MARGIN + 12, MARGIN + 12))
+            draw_frame(screen, game, hand, font, big)
 
             pygame.display.flip()
             clock.tick(FPS)
+            if profiler.active:
+                profiler.mark_frame(frame_no, clock.get_rawtime())
+            frame_no += 1
     finally:
+        profiler.stop()
+        profiler.restore_signal()
         if hand is not None:
             hand.release()
         pygame.quit()
 
 
+def draw_frame(screen, game: Game, hand, font, big):
+    play_w = BOARD_COLS * CELL_SIZE
+    play_h = BOARD_ROWS * CELL_SIZE
+
+    screen.fill(COLORS["bg"])
+
+    field_rect = pygame.Rect(MARGIN, MARGIN, play_w, play_h)
+    pygame.draw.rect(screen, COLORS["frame"], field_rect, width=2)
+
+    for r in range(BOARD_ROWS):
+        y = MARGIN + r*CELL_SIZE
+        pygame.draw.line(screen, COLORS["grid"], (MARGIN, y), (MARGIN+play_w, y))
+    for c in range(BOARD_COLS):
+        x = MARGIN + c*CELL_SIZE
+        pygame.draw.line(screen, COLORS["grid"], (x, MARGIN), (x, MARGIN+play_h))
+
+    for r, c in game.get_ghost_cells():
+        draw_cell(screen, r, c, (255,255,255), alpha=70)
+
+    for r, c, k in game.get_cells():
+        draw_cell(screen, r, c, COLORS[k])
+
+    panel_x = MARGIN*2 + play_w
+    panel_y = MARGIN
+
+    # NEXT panel
+    title = big.render("NEXT", True, COLORS["text"])
+    screen.blit(title, (panel_x, panel_y))
+    panel_y += 28
+
+    queue = game.get_next_queue()[:NEXT_PREVIEW_COUNT]
+    for i, kind in enumerate(queue):
+        draw_mini_piece(screen, kind, panel_x, panel_y + i*CELL_SIZE*3)
+
+    info_y = panel_y + NEXT_PREVIEW_COUNT*CELL_SIZE*3 + 10
+    score_surf = font.render(f"Score: {game.score}", True, COLORS["text"])
+    lines_surf = font.render(f"Lines: {game.lines_cleared}", True, COLORS["text"])
+    screen.blit(score_surf, (panel_x, info_y))
+    screen.blit(lines_surf, (panel_x, info_y + 22))
+
+    # Camera preview (below the info)
+    cam_frame = hand.get_last_frame() if hand is not None else None
+    if cam_frame is not None:
+        cam_h = int(CELL_SIZE * 6)
+        cam_w = CELL_SIZE * 8
+        preview = cv2.cvtColor(cam_frame, cv2.COLOR_BGR2RGB)
+        preview = cv2.resize(preview, (cam_w, cam_h))
+        surf = pygame.image.frombuffer(preview.tobytes(), (cam_w, cam_h), 'RGB')
+        screen.blit(surf, (panel_x, info_y + 48))
+
+    # hint = font.render("←/→ Move  ↑/Z Rot  ↓ Soft  SPACE Hard  |  Palm bins ON | Hold removed", True, COLORS["text"])
+    # screen.blit(hint, (MARGIN + 8, play_h + MARGIN - 24))
+
+    if game.state is GameState.GAME_OVER:
+        overlay = big.render("GAME OVER — press ESC", True, COLORS["text"])
+        screen.blit(overlay, (MARGIN + 12, MARGIN + 12))
+
+
 def draw_cell(screen, r: int, c: int, color: Tuple[int,int,int], alpha: int = 255):
     x = MARGIN + c*CELL_SIZE
     y = MARGIN + r*CELL_SIZE
@@ -162,6 +182,18 @@ def draw_mini_piece(screen, kind: str, x: int, y: int):
                 pygame.draw.rect(screen, color, rect, border_radius=4)
 
 
+def bin_step_action(game: Game, target_bin: Optional[int]) -> Optional[Action]:
+    """손바닥 bin이 가리키는 칼럼으로 한 칸 다가가는 이동 액션 (이미 도착했거나 bin이 없으면 None)"""
+    if target_bin is None or game.state is not GameState.RUNNING or game.active is None:
+        return None
+    desired_c = _target_col_from_bin(game, target_bin)
+    if game.active.c < desired_c:
+        return Action.MOVE_RIGHT
+    if game.active.c > desired_c:
+        return Action.MOVE_LEFT
+    return None
+
+
 def _target_col_from_bin(game: Game, bin_idx: int) -> int:
     assert game.active is not None
     kind = game.active.kind
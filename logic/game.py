@@ -100,18 +100,39 @@ class Game:
     lines_cleared: int = 0
     frame_counter: int = 0
     lock_counter: int = 0
+    board_version: int = 0  # 보드(grid)가 바뀔 때마다 증가 (락 / 리셋)
 
     def __post_init__(self):
         if not self.grid:
             self.grid = [[None for _ in range(self.cols)] for _ in range(self.rows)]
+        self._start()
+
+    def _start(self):
         self._refill_bag()
         for _ in range(4):
             self._push_next(self._draw_bag())
         self._spawn_next()
 
+    # ----- Restart (reuses grid rows / lists) -----
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.rng.seed(seed)
+        for row in self.grid:
+            for c in range(self.cols):
+                row[c] = None
+        self.next_queue.clear()
+        self.active = None
+        self.state = GameState.RUNNING
+        self.score = 0
+        self.lines_cleared = 0
+        self.frame_counter = 0
+        self.lock_counter = 0
+        self.board_version += 1
+        self._start()
+
     # ----- Random bag -----
     def _refill_bag(self):
-        self.bag = ["I","O","T","S","Z","J","L"]
+        self.bag[:] = ["I","O","T","S","Z","J","L"]
         self.rng.shuffle(self.bag)
 
     def _draw_bag(self) -> str:
@@ -154,17 +175,28 @@ class Game:
         for r, c in self.active.cells:
             if 0 <= r < self.rows and 0 <= c < self.cols:
                 self.grid[r][c] = self.active.kind
+        self.board_version += 1
         cleared = self._clear_lines()
         self._update_score(cleared)
         self._spawn_next()
         self.lock_counter = 0
 
     def _clear_lines(self) -> int:
-        new_grid = [row for row in self.grid if any(cell is None for cell in row)]
-        cleared = self.rows - len(new_grid)
-        for _ in range(cleared):
-            new_grid.insert(0, [None]*self.cols)
-        self.grid = new_grid
+        # 줄 리스트를 새로 만들지 않고 self.grid 안에서 아래로 당긴 뒤, 지운 줄을 비워 맨 위에 재사용
+        full = []
+        write = self.rows - 1
+        for read in range(self.rows - 1, -1, -1):
+            row = self.grid[read]
+            if any(cell is None for cell in row):
+                self.grid[write] = row
+                write -= 1
+            else:
+                full.append(row)
+        for i, row in enumerate(full):
+            for c in range(self.cols):
+                row[c] = None
+            self.grid[i] = row
+        cleared = len(full)
         self.lines_cleared += cleared
         return cleared
 
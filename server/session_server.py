@@ -0,0 +1,315 @@
+# ===== server/session_server.py (headless multi-session host) =====
+from __future__ import annotations
+from dataclasses import dataclass, field
+import argparse
+import asyncio
+import random
+import struct
+from typing import Dict, List, Optional, Set
+
+from logic.game import Game, Action, GameState
+from config import BOARD_COLS, BOARD_ROWS, FPS, SERVER_HOST, SERVER_PORT, SERVER_MAX_BUFFER
+
+# ===== Wire protocol =====
+# 모든 메시지: [type u8][len u16][payload]
+#   C->S JOIN     : session u32 (0 = 새 세션), role u8 (ROLE_*)
+#   C->S ACTION   : action u8 (Action.value)
+#   S->C WELCOME  : session u32, rows u8, cols u8
+#   S->C DELTA    : frame u32, score u32, lines u16, state u8,
+#                   active kind u8, r i8, c i8, rot u8,
+#                   n u16, n x (r u8, c u8, kind u8)   # 바뀐 보드 칸만
+#   S->C SNAPSHOT : DELTA와 같은 상태 헤더(n 제외) + rows*cols 바이트 보드
+#                   # JOIN 직후 해당 클라이언트에게만. 받은 보드로 통째로 교체
+#   S->C ERROR    : utf-8 메시지
+MSG_JOIN = 1
+MSG_ACTION = 2
+MSG_WELCOME = 3
+MSG_DELTA = 4
+MSG_ERROR = 5
+MSG_SNAPSHOT = 6
+
+ROLE_PLAYER = 0
+ROLE_SPECTATOR = 1
+
+HEADER = struct.Struct("!BH")
+JOIN = struct.Struct("!IB")
+WELCOME = struct.Struct("!IBB")
+STATE_HEAD = struct.Struct("!IIHBBbbB")
+DELTA_HEAD = struct.Struct(STATE_HEAD.format + "H")
+DELTA_CELL = struct.Struct("!BBB")
+
+KINDS = ["I", "O", "T", "S", "Z", "J", "L"]
+KIND_CODE = {k: i + 1 for i, k in enumerate(KINDS)}  # 0 = 빈 칸 / 활성 피스 없음
+ACTIONS = {a.value: a for a in Action if a is not Action.TICK}
+
+
+def encode(msg_type: int, payload: bytes = b"") -> bytes:
+    return HEADER.pack(msg_type, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader):
+    head = await reader.readexactly(HEADER.size)
+    msg_type, size = HEADER.unpack(head)
+    payload = await reader.readexactly(size) if size else b""
+    return msg_type, payload
+
+
+def encode_board(game: Game) -> bytes:
+    """보드를 rows*cols 바이트(KIND_CODE)로 평탄화"""
+    code = KIND_CODE.get
+    return bytes([code(k, 0) for row in game.grid for k in row])
+
+
+def _state_fields(game: Game) -> tuple:
+    p = game.active
+    return (
+        game.frame_counter, game.score, game.lines_cleared,
+        1 if game.state is GameState.GAME_OVER else 0,
+        KIND_CODE[p.kind] if p is not None else 0,
+        p.r if p is not None else 0, p.c if p is not None else 0,
+        p.rot % 4 if p is not None else 0,
+    )
+
+
+def encode_delta(game: Game, prev: Optional[bytes], board: Optional[bytes],
+                 state: Optional[tuple] = None) -> bytes:
+    """prev 대비 바뀐 칸만 담은 DELTA. board가 None이면 보드는 그대로(상태 헤더만)"""
+    cols = game.cols
+    cells = bytearray()
+    n = 0
+    if board is not None:
+        for i, code in enumerate(board):
+            if (prev[i] if prev is not None else 0) != code:
+                cells += DELTA_CELL.pack(i // cols, i % cols, code)
+                n += 1
+    head = DELTA_HEAD.pack(*(state or _state_fields(game)), n)
+    return encode(MSG_DELTA, head + bytes(cells))
+
+
+def encode_snapshot(game: Game) -> bytes:
+    """새 구독자용 전체 상태. 클라이언트는 보드를 이 내용으로 교체"""
+    return encode(MSG_SNAPSHOT, STATE_HEAD.pack(*_state_fields(game)) + encode_board(game))
+
+
+# ===== Sessions =====
+@dataclass
+class Session:
+    sid: int
+    game: Game
+    pending: List[Action] = field(default_factory=list)
+    players: Set[asyncio.StreamWriter] = field(default_factory=set)
+    spectators: Set[asyncio.StreamWriter] = field(default_factory=set)
+    board: Optional[bytes] = None  # 마지막으로 브로드캐스트한 보드
+    version: int = -1              # board를 만든 시점의 game.board_version
+    state: Optional[tuple] = None  # 마지막으로 브로드캐스트한 _state_fields
+
+
+class SessionServer:
+    """하나의 이벤트 루프에서 여러 Game 세션을 한 번의 배치 틱으로 진행"""
+
+    def __init__(self, fps: int = FPS, rows: int = BOARD_ROWS, cols: int = BOARD_COLS):
+        self.fps = fps
+        self.rows = rows
+        self.cols = cols
+        self.sessions: Dict[int, Session] = {}
+        self.next_sid = 1
+        self.ticks = 0
+
+    # ---------- 세션 관리 ----------
+    def create_session(self, seed: Optional[int] = None) -> Session:
+        sid = self.next_sid
+        self.next_sid += 1
+        game = Game(rows=self.rows, cols=self.cols, rng=random.Random(seed))
+        s = Session(sid=sid, game=game)
+        self.sessions[sid] = s
+        return s
+
+    def _detach(self, s: Session, writer: asyncio.StreamWriter):
+        s.players.discard(writer)
+        s.spectators.discard(writer)
+        if not s.players and s.sid in self.sessions:
+            # 플레이어가 모두 떠난 세션은 관전자와 함께 정리
+            for w in s.spectators:
+                w.close()
+            del self.sessions[s.sid]
+
+    # ---------- 배치 틱 ----------
+    def tick(self):
+        """모든 세션을 한 프레임 진행하고, 바뀐 것이 있는 세션의 구독자에게만 델타 전송"""
+        self.ticks += 1
+        dropped: List[tuple] = []
+        for s in self.sessions.values():
+            game = s.game
+            if s.pending:
+                for act in s.pending:
+                    game.step(act)
+                s.pending.clear()
+            game.step(Action.TICK)
+
+            if not s.players and not s.spectators:
+                continue
+            board = None
+            if game.board_version != s.version:
+                # 보드는 락/라인 클리어 때만 바뀜. 그 외 틱은 상태 헤더만 보냄
+                board = encode_board(game)
+            state = _state_fields(game)
+            # 프레임 번호만 바뀐 틱(중력 대기, GAME_OVER 등)은 보내지 않음
+            if board is None and s.state is not None and state[1:] == s.state[1:]:
+                continue
+            msg = encode_delta(game, s.board, board, state)
+            s.state = state
+            if board is not None:
+                s.board = board
+                s.version = game.board_version
+            for group in (s.players, s.spectators):
+                for w in group:
+                    # 느린 클라이언트는 버퍼가 가득 차면 끊음(틱 루프는 절대 await 하지 않음).
+                    # close()는 버퍼가 빌 때까지 기다리므로 abort()로 즉시 끊음
+                    if w.transport.get_write_buffer_size() > SERVER_MAX_BUFFER:
+                        w.transport.abort()
+                        dropped.append((s, w))
+                    else:
+                        w.write(msg)
+        for s, w in dropped:
+            self._detach(s, w)
+
+    async def run_ticks(self):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.fps
+        deadline = loop.time()
+        while True:
+            self.tick()
+            deadline += period
+            delay = deadline - loop.time()
+            if delay < -period:
+                # 너무 밀렸으면 따라잡기 대신 기준 시각을 재설정
+                deadline = loop.time()
+                delay = 0.0
+            await asyncio.sleep(max(0.0, delay))
+
+    # ---------- 연결 처리 ----------
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session: Optional[Session] = None
+        try:
+            while True:
+                msg_type, payload = await read_message(reader)
+                if msg_type == MSG_JOIN:
+                    if len(payload) != JOIN.size:
+                        writer.write(encode(MSG_ERROR, b"bad join"))
+                        continue
+                    sid, role = JOIN.unpack(payload)
+                    if role not in (ROLE_PLAYER, ROLE_SPECTATOR):
+                        writer.write(encode(MSG_ERROR, f"bad role {role}".encode()))
+                        continue
+                    if session is not None:
+                        # 연결당 세션은 하나. 다른 세션은 새 연결로
+                        writer.write(encode(MSG_ERROR, f"already in session {session.sid}".encode()))
+                        continue
+                    if sid == 0:
+                        if role == ROLE_SPECTATOR:
+                            writer.write(encode(MSG_ERROR, b"spectators must name a session"))
+                            continue
+                        session = self.create_session()
+                    else:
+                        session = self.sessions.get(sid)
+                        if session is None:
+                            writer.write(encode(MSG_ERROR, f"no session {sid}".encode()))
+                            continue
+                    if role == ROLE_SPECTATOR:
+                        session.spectators.add(writer)
+                    else:
+                        session.players.add(writer)
+                    writer.write(encode(MSG_WELCOME, WELCOME.pack(session.sid, self.rows, self.cols)))
+                    writer.write(encode_snapshot(session.game))
+                elif msg_type == MSG_ACTION:
+                    if session is None or writer not in session.players:
+                        continue
+                    act = ACTIONS.get(payload[0]) if payload else None
+                    if act is not None:
+                        session.pending.append(act)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if session is not None:
+                self._detach(session, writer)
+            writer.close()
+
+    async def serve(self, host: str = SERVER_HOST, port: int = SERVER_PORT, unix: Optional[str] = None):
+        if unix:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_ticks())
+
+
+# ===== 부하 테스트용 봇 =====
+async def run_bot(host: str = SERVER_HOST, port: int = SERVER_PORT, unix: Optional[str] = None,
+                  session: int = 0, role: int = ROLE_PLAYER, seed: Optional[int] = None,
+                  games: int = 0):
+    """무작위 액션을 보내는 플레이어 봇(또는 관전자).
+
+    플레이어는 게임 오버마다 새 연결로 새 세션을 열어 games판(0이면 무한) 계속 플레이하므로
+    부하가 일정하게 유지됨. 관전자는 보던 게임이 끝나면 종료.
+    """
+    rng = random.Random(seed)
+    played = 0
+    actions = list(ACTIONS.values())
+    while not games or played < games:
+        try:
+            if unix:
+                reader, writer = await asyncio.open_unix_connection(unix)
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+        except OSError as e:
+            print(f"[bot {seed}] connect failed: {e}")
+            return
+        writer.write(encode(MSG_JOIN, JOIN.pack(session, role)))
+        try:
+            while True:
+                msg_type, payload = await read_message(reader)
+                if msg_type == MSG_ERROR:
+                    return
+                if msg_type != MSG_DELTA:
+                    continue
+                game_over = DELTA_HEAD.unpack_from(payload)[3]
+                if game_over:
+                    break
+                if role == ROLE_PLAYER and rng.random() < 0.2:
+                    act = rng.choice(actions)
+                    writer.write(encode(MSG_ACTION, bytes([act.value])))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+        played += 1
+        if role != ROLE_PLAYER:
+            return
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless Hand-Tetris session server")
+    ap.add_argument("--host", default=SERVER_HOST)
+    ap.add_argument("--port", type=int, default=SERVER_PORT)
+    ap.add_argument("--unix", default=None, help="TCP 대신 유닉스 소켓 경로")
+    ap.add_argument("--bots", type=int, default=0, help="같은 루프에서 띄울 봇 플레이어 수")
+    args = ap.parse_args()
+
+    async def _main():
+        srv = SessionServer()
+        task = asyncio.create_task(srv.serve(args.host, args.port, args.unix))
+        bots = []  # 태스크가 GC되지 않도록 참조 유지
+        if args.bots:
+            await asyncio.sleep(0.1)
+            for i in range(args.bots):
+                bots.append(asyncio.create_task(run_bot(args.host, args.port, args.unix, seed=i)))
+        await task
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()